@@ -3,8 +3,10 @@ API REST para rastreo de encomiendas de Rápido Ochoa
 Optimizada para respuesta rápida
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from pydantic import BaseModel
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -13,8 +15,14 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from typing import List, Optional
-from datetime import datetime
+from contextlib import closing
+from typing import Iterator, List, Optional
+from datetime import date, datetime, timedelta
+import csv
+import io
+import os
+import sqlite3
+import orjson
 import time
 import logging
 import re
@@ -26,7 +34,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="API Rápido Ochoa Rastreo",
     description="API para consultar información de encomiendas de Rápido Ochoa",
-    version="2.1.0"
+    version="2.2.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configurar CORS
@@ -38,6 +47,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Comprimir respuestas grandes (historial, lotes, exportaciones)
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
 # Modelos
 class EventoTrazabilidad(BaseModel):
     fecha: str
@@ -428,38 +440,262 @@ class RapidoOchoaScraper:
         texto = ' '.join(texto.split())
         return texto.strip()
 
+class AlmacenEncomiendas:
+    """Guarda localmente el último estado consultado de cada guía (SQLite)"""
+
+    COLUMNAS_ENCOMIENDA = [
+        "numero_guia", "documento_anexo", "fecha_admision", "origen", "destino",
+        "remitente_nombre", "destinatario_nombre", "total_unidades",
+        "estado_actual", "fecha_consulta"
+    ]
+    COLUMNAS_TRAZABILIDAD = ["numero_guia", "fecha", "detalle", "sede", "estado"]
+    COLUMNAS_PRODUCTO = ["numero_guia", "empaque", "dice_contener", "unidades", "peso_cobrar"]
+
+    def __init__(self, ruta: str):
+        self.ruta = ruta
+        with closing(self._conectar()) as conexion, conexion:
+            conexion.execute("""
+                CREATE TABLE IF NOT EXISTS encomiendas (
+                    numero_guia TEXT PRIMARY KEY,
+                    fecha_admision TEXT,
+                    origen TEXT,
+                    destino TEXT,
+                    estado_actual TEXT,
+                    fecha_consulta TEXT,
+                    datos TEXT NOT NULL
+                )
+            """)
+            conexion.execute(
+                "CREATE INDEX IF NOT EXISTS idx_encomiendas_fecha ON encomiendas (fecha_admision)"
+            )
+
+    def _conectar(self, check_same_thread: bool = True) -> sqlite3.Connection:
+        """Abre una conexión nueva (cada hilo del threadpool usa la suya)"""
+        return sqlite3.connect(self.ruta, check_same_thread=check_same_thread)
+
+    def guardar(self, datos: DatosEncomienda):
+        """Inserta o actualiza el estado de una guía"""
+        try:
+            with closing(self._conectar()) as conexion, conexion:
+                conexion.execute(
+                    """
+                    INSERT INTO encomiendas
+                        (numero_guia, fecha_admision, origen, destino, estado_actual, fecha_consulta, datos)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(numero_guia) DO UPDATE SET
+                        fecha_admision = excluded.fecha_admision,
+                        origen = excluded.origen,
+                        destino = excluded.destino,
+                        estado_actual = excluded.estado_actual,
+                        fecha_consulta = excluded.fecha_consulta,
+                        datos = excluded.datos
+                    """,
+                    (
+                        datos.numero_guia,
+                        datos.fecha_admision,
+                        datos.origen,
+                        datos.destino,
+                        datos.estado_actual,
+                        datos.fecha_consulta,
+                        datos.model_dump_json()
+                    )
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ No se pudo guardar la guía {datos.numero_guia}: {e}")
+
+    @staticmethod
+    def _escapar_like(valor: str) -> str:
+        """Escapa los comodines de LIKE para buscar el texto literal"""
+        return valor.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+    def iterar(
+        self,
+        desde: Optional[date] = None,
+        hasta: Optional[date] = None,
+        origen: Optional[str] = None,
+        destino: Optional[str] = None,
+        estado: Optional[str] = None
+    ) -> Iterator[str]:
+        """Recorre el JSON de las guías que cumplen los filtros, fila por fila"""
+        condiciones = []
+        parametros = []
+        # fecha_admision se guarda como "YYYY/MM/DD HH:MM", comparable como texto
+        if desde or hasta:
+            condiciones.append("fecha_admision != ''")
+        if desde:
+            condiciones.append("fecha_admision >= ?")
+            parametros.append(desde.strftime("%Y/%m/%d"))
+        if hasta:
+            condiciones.append("fecha_admision < ?")
+            parametros.append((hasta + timedelta(days=1)).strftime("%Y/%m/%d"))
+        for columna, valor in (("origen", origen), ("destino", destino)):
+            if valor:
+                condiciones.append(f"{columna} LIKE ? ESCAPE '\\'")
+                parametros.append(f"%{self._escapar_like(valor)}%")
+        if estado:
+            condiciones.append("estado_actual = ? COLLATE NOCASE")
+            parametros.append(estado)
+
+        consulta = "SELECT datos FROM encomiendas"
+        if condiciones:
+            consulta += " WHERE " + " AND ".join(condiciones)
+        consulta += " ORDER BY fecha_admision, numero_guia"
+
+        # StreamingResponse avanza el generador desde distintos hilos del threadpool;
+        # la conexión es de uso exclusivo de este generador, un paso a la vez
+        with closing(self._conectar(check_same_thread=False)) as conexion:
+            for (datos,) in conexion.execute(consulta, parametros):
+                yield datos
+
+    def filas(self, tipo: str, **filtros) -> Iterator[dict]:
+        """Aplana las guías en filas de encomienda, trazabilidad o producto"""
+        for datos in self.iterar(**filtros):
+            encomienda = orjson.loads(datos)
+            if tipo == "encomiendas":
+                yield {columna: encomienda.get(columna) for columna in self.COLUMNAS_ENCOMIENDA}
+            elif tipo == "trazabilidad":
+                for evento in encomienda.get("trazabilidad", []):
+                    yield {"numero_guia": encomienda["numero_guia"], **evento}
+            elif tipo == "productos":
+                for producto in encomienda.get("productos", []):
+                    yield {"numero_guia": encomienda["numero_guia"], **producto}
+
 # Instancia del scraper
 scraper = RapidoOchoaScraper()
 
+# Almacén local de consultas
+almacen = AlmacenEncomiendas(os.getenv("RUTA_ALMACEN", "encomiendas.db"))
+
+CAMPOS_ENCOMIENDA = set(DatosEncomienda.model_fields)
+
+RESPUESTAS_RASTREO = {
+    200: {
+        "model": DatosEncomienda,
+        "description": "Encomienda completa. Con `fields` solo se incluyen los campos pedidos."
+    }
+}
+
+QUERY_FIELDS = Query(None, description="Campos a incluir separados por coma, ej: numero_guia,estado_actual")
+
+def _parsear_campos(fields: Optional[str]) -> Optional[set]:
+    """Convierte el parámetro fields en el conjunto de campos a incluir"""
+    if not fields:
+        return None
+    campos = {campo.strip() for campo in fields.split(",") if campo.strip()}
+    invalidos = campos - CAMPOS_ENCOMIENDA
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos no válidos: {', '.join(sorted(invalidos))}"
+        )
+    return campos or None
+
+def _responder_encomienda(datos: DatosEncomienda, campos: Optional[set]) -> ORJSONResponse:
+    """Serializa la encomienda con orjson y reporta el costo en Server-Timing"""
+    inicio = time.perf_counter()
+    respuesta = ORJSONResponse(datos.model_dump(include=campos))
+    duracion_ms = (time.perf_counter() - inicio) * 1000
+    respuesta.headers["Server-Timing"] = f"serializacion;dur={duracion_ms:.3f}"
+    return respuesta
+
+def _generar_ndjson(tipo: str, filtros: dict) -> Iterator[bytes]:
+    """Genera una línea JSON por guía o por fila aplanada"""
+    if tipo == "completo":
+        for datos in almacen.iterar(**filtros):
+            yield datos.encode() + b"\n"
+    else:
+        for fila in almacen.filas(tipo, **filtros):
+            yield orjson.dumps(fila) + b"\n"
+
+def _generar_csv(tipo: str, filtros: dict) -> Iterator[str]:
+    """Genera el CSV fila por fila reutilizando un único buffer"""
+    columnas = {
+        "encomiendas": AlmacenEncomiendas.COLUMNAS_ENCOMIENDA,
+        "trazabilidad": AlmacenEncomiendas.COLUMNAS_TRAZABILIDAD,
+        "productos": AlmacenEncomiendas.COLUMNAS_PRODUCTO,
+    }[tipo]
+    buffer = io.StringIO()
+    escritor = csv.DictWriter(buffer, fieldnames=columnas, extrasaction="ignore")
+    escritor.writeheader()
+    yield buffer.getvalue()
+    for fila in almacen.filas(tipo, **filtros):
+        buffer.seek(0)
+        buffer.truncate(0)
+        escritor.writerow(fila)
+        yield buffer.getvalue()
+
 # Endpoints
 @app.get("/")
 def root():
     return {
         "mensaje": "API de Rápido Ochoa - Rastreo de Encomiendas",
-        "version": "2.1.0",
+        "version": app.version,
         "empresa": "Rápido Ochoa",
         "ejemplo_guia": "E121101188",
         "tiempo_respuesta": "~12-15 segundos",
         "endpoints": {
             "consultar_get": "/api/rastreo/{numero_guia}",
+            "consultar_campos": "/api/rastreo/{numero_guia}?fields=numero_guia,estado_actual",
             "consultar_post": "/api/rastreo",
+            "exportar": "/api/exportar?formato=csv&tipo=trazabilidad",
             "health": "/api/health",
             "docs": "/docs",
             "redoc": "/redoc"
         }
     }
 
-@app.get("/api/rastreo/{numero_guia}", response_model=DatosEncomienda)
-def consultar_guia_get(numero_guia: str):
+@app.get("/api/rastreo/{numero_guia}", response_class=ORJSONResponse, responses=RESPUESTAS_RASTREO)
+def consultar_guia_get(
+    numero_guia: str,
+    fields: Optional[str] = QUERY_FIELDS
+):
     """Consulta una guía de Rápido Ochoa (GET)"""
+    campos = _parsear_campos(fields)
     logger.info(f"📦 Nueva consulta: {numero_guia}")
-    return scraper.consultar_guia(numero_guia)
+    datos = scraper.consultar_guia(numero_guia)
+    almacen.guardar(datos)
+    return _responder_encomienda(datos, campos)
 
-@app.post("/api/rastreo", response_model=DatosEncomienda)
-def consultar_guia_post(consulta: ConsultaRequest):
+@app.post("/api/rastreo", response_class=ORJSONResponse, responses=RESPUESTAS_RASTREO)
+def consultar_guia_post(
+    consulta: ConsultaRequest,
+    fields: Optional[str] = QUERY_FIELDS
+):
     """Consulta una guía de Rápido Ochoa (POST)"""
+    campos = _parsear_campos(fields)
     logger.info(f"📦 Nueva consulta POST: {consulta.numero_guia}")
-    return scraper.consultar_guia(consulta.numero_guia)
+    datos = scraper.consultar_guia(consulta.numero_guia)
+    almacen.guardar(datos)
+    return _responder_encomienda(datos, campos)
+
+@app.get("/api/exportar")
+def exportar(
+    formato: str = Query("ndjson", description="ndjson o csv"),
+    tipo: str = Query("encomiendas", description="completo (solo ndjson), encomiendas, trazabilidad o productos"),
+    desde: Optional[date] = Query(None, description="Fecha de admisión inicial (YYYY-MM-DD)"),
+    hasta: Optional[date] = Query(None, description="Fecha de admisión final (YYYY-MM-DD)"),
+    origen: Optional[str] = None,
+    destino: Optional[str] = None,
+    estado: Optional[str] = None
+):
+    """Exporta las guías guardadas localmente, sin consultar el portal"""
+    if formato not in ("ndjson", "csv"):
+        raise HTTPException(status_code=400, detail="Formato no válido. Usa ndjson o csv")
+    tipos_validos = ("encomiendas", "trazabilidad", "productos")
+    if tipo not in tipos_validos + ("completo",) or (formato == "csv" and tipo == "completo"):
+        raise HTTPException(status_code=400, detail=f"Tipo no válido para {formato}")
+    if desde and hasta and desde > hasta:
+        raise HTTPException(status_code=400, detail="La fecha desde no puede ser posterior a hasta")
+
+    filtros = {"desde": desde, "hasta": hasta, "origen": origen, "destino": destino, "estado": estado}
+    logger.info(f"📤 Exportando {tipo} en {formato}")
+    if formato == "csv":
+        return StreamingResponse(
+            _generar_csv(tipo, filtros),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{tipo}.csv"'}
+        )
+    return StreamingResponse(_generar_ndjson(tipo, filtros), media_type="application/x-ndjson")
 
 @app.get("/api/health")
 def health_check():
@@ -468,7 +704,7 @@ def health_check():
         "status": "ok",
         "timestamp": datetime.now().isoformat(),
         "service": "Rápido Ochoa Rastreo API",
-        "version": "2.1.0"
+        "version": app.version
     }
 
 if __name__ == "__main__":
@@ -0,0 +1,252 @@
+"""
+Prueba de carga para la API de Rápido Ochoa
+Ejecutar con: python prueba_carga.py --url http://localhost:8000 --guias E121101188 --concurrencia 10 --duracion 60
+
+Las métricas principales del reporte cubren solo la ventana estable: peticiones
+iniciadas entre el fin de la rampa y el fin de la duración. Las de la rampa se
+reportan aparte en la sección "rampa".
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+
+import requests
+
+def percentil(valores, p):
+    """Percentil por rango más cercano sobre una lista ordenada"""
+    if not valores:
+        return None
+    indice = min(len(valores) - 1, max(0, math.ceil(p / 100 * len(valores)) - 1))
+    return valores[indice]
+
+def resumir(valores):
+    """Resume una lista de latencias en milisegundos"""
+    ordenados = sorted(valores)
+    return {
+        "p50": percentil(ordenados, 50),
+        "p95": percentil(ordenados, 95),
+        "p99": percentil(ordenados, 99),
+        "max": ordenados[-1] if ordenados else None,
+        "promedio": sum(ordenados) / len(ordenados) if ordenados else None,
+    }
+
+class GeneradorCarga:
+    def __init__(self, args):
+        self.args = args
+        self.guias = args.guias
+        self.aleatorio = random.Random(args.semilla)
+        self.candado = threading.Lock()
+        self.resultados = []
+        self.contador_invalidas = 0
+        self.inicio = None
+        self.detener = threading.Event()
+        self.interrumpida = False
+
+    def _elegir_guia(self):
+        """Elige una guía de la mezcla: repetidas de la lista o inválidas nuevas"""
+        with self.candado:
+            if self.aleatorio.random() < self.args.proporcion_invalidas:
+                self.contador_invalidas += 1
+                return f"INVALIDA{self.contador_invalidas:06d}", True
+            return self.aleatorio.choice(self.guias), False
+
+    def _consultar(self, sesion, guia):
+        """Hace una consulta y devuelve (estado, latencia_ms, serializacion_ms)"""
+        params = {"fields": self.args.fields} if self.args.fields else None
+        inicio = time.perf_counter()
+        try:
+            respuesta = sesion.get(
+                f"{self.args.url}/api/rastreo/{guia}",
+                params=params,
+                timeout=self.args.timeout
+            )
+            estado = str(respuesta.status_code)
+            serializacion = None
+            match = re.search(r'serializacion;dur=([\d.]+)', respuesta.headers.get("Server-Timing", ""))
+            if match:
+                serializacion = float(match.group(1))
+        except requests.exceptions.Timeout:
+            estado, serializacion = "timeout", None
+        except requests.exceptions.RequestException:
+            estado, serializacion = "conexion", None
+        return estado, (time.perf_counter() - inicio) * 1000, serializacion
+
+    def _trabajador(self, indice, fin):
+        """Consulta en bucle hasta que se cumpla la duración"""
+        # Rampa: los trabajadores arrancan escalonados durante args.rampa segundos
+        retraso = self.args.rampa * indice / self.args.concurrencia
+        if self.detener.wait(retraso):
+            return
+        sesion = requests.Session()
+        while time.monotonic() < fin and not self.detener.is_set():
+            guia, invalida = self._elegir_guia()
+            momento = time.monotonic() - self.inicio
+            estado, latencia, serializacion = self._consultar(sesion, guia)
+            with self.candado:
+                self.resultados.append((momento, estado, latencia, serializacion, invalida))
+        sesion.close()
+
+    def ejecutar(self):
+        """Lanza los trabajadores y devuelve el reporte"""
+        self.inicio = time.monotonic()
+        fin = self.inicio + self.args.rampa + self.args.duracion
+        hilos = [
+            threading.Thread(target=self._trabajador, args=(i, fin), daemon=True)
+            for i in range(self.args.concurrencia)
+        ]
+        for hilo in hilos:
+            hilo.start()
+        try:
+            for hilo in hilos:
+                hilo.join()
+        except KeyboardInterrupt:
+            # Ctrl-C: esperar las peticiones en curso y reportar lo recolectado
+            print("\n⏹️  Prueba interrumpida, esperando peticiones en curso...")
+            self.interrumpida = True
+            self.detener.set()
+            for hilo in hilos:
+                hilo.join()
+        return self._reporte(time.monotonic() - self.inicio)
+
+    @staticmethod
+    def _resumir_ventana(resultados, segundos):
+        """Resume las peticiones iniciadas dentro de una ventana de `segundos`"""
+        estados = Counter(estado for _, estado, _, _, _ in resultados)
+        return {
+            "segundos": segundos,
+            "total_peticiones": len(resultados),
+            "rendimiento_rps": len(resultados) / segundos if segundos else None,
+            "latencia_ms": resumir([latencia for _, _, latencia, _, _ in resultados]),
+            "latencia_exitosas_ms": resumir(
+                [latencia for _, estado, latencia, _, _ in resultados if estado == "200"]
+            ),
+            "serializacion_ms": resumir([s for _, _, _, s, _ in resultados if s is not None]),
+            "estados": dict(estados),
+            "estados_guias_invalidas": dict(
+                Counter(estado for _, estado, _, _, invalida in resultados if invalida)
+            ),
+            "errores": {estado: n for estado, n in estados.items() if estado != "200"},
+        }
+
+    def _reporte(self, segundos):
+        """Construye el reporte legible por máquina"""
+        rampa = [r for r in self.resultados if r[0] < self.args.rampa]
+        estable = [r for r in self.resultados if r[0] >= self.args.rampa]
+        # Si la prueba se interrumpe, las ventanas se recortan al tiempo transcurrido
+        segundos_rampa = min(self.args.rampa, segundos)
+        segundos_estables = max(0.0, min(self.args.duracion, segundos - self.args.rampa))
+
+        return {
+            "fecha": datetime.now().isoformat(),
+            "version_api": self._version_api(),
+            "configuracion": {
+                "url": self.args.url,
+                "concurrencia": self.args.concurrencia,
+                "rampa_s": self.args.rampa,
+                "duracion_s": self.args.duracion,
+                "guias": self.guias,
+                "proporcion_invalidas": self.args.proporcion_invalidas,
+                "fields": self.args.fields,
+                "semilla": self.args.semilla,
+            },
+            "segundos_totales": segundos,
+            "interrumpida": self.interrumpida,
+            "ventana": {
+                "desde_s": self.args.rampa,
+                "hasta_s": self.args.rampa + segundos_estables,
+                "descripcion": "Métricas de peticiones iniciadas tras la rampa y antes del fin de la duración",
+            },
+            **self._resumir_ventana(estable, segundos_estables),
+            "rampa": self._resumir_ventana(rampa, segundos_rampa),
+        }
+
+    def _version_api(self):
+        try:
+            return requests.get(f"{self.args.url}/api/health", timeout=5).json().get("version")
+        except Exception:
+            return None
+
+def imprimir_reporte(reporte):
+    """Muestra el resumen en consola"""
+    def ms(valor):
+        return f"{valor:.1f}" if valor is not None else "N/A"
+
+    def rps(valor):
+        return f"{valor:.2f}" if valor is not None else "N/A"
+
+    print("\n" + "="*60)
+    print("   📊 RESULTADOS DE LA PRUEBA DE CARGA")
+    print("="*60)
+    print(f"🏷️  Versión API: {reporte['version_api'] or 'N/A'}")
+    if reporte["interrumpida"]:
+        print("⏹️  Resultados parciales: la prueba fue interrumpida")
+    print(f"🪜 Rampa: {reporte['rampa']['total_peticiones']} peticiones en {reporte['rampa']['segundos']:.1f}s (excluidas)")
+    print(f"📦 Peticiones estables: {reporte['total_peticiones']} en {reporte['segundos']:.1f}s")
+    print(f"🚀 Rendimiento estable: {rps(reporte['rendimiento_rps'])} peticiones/s")
+    for titulo, clave in (("Latencia", "latencia_ms"), ("Latencia 200", "latencia_exitosas_ms"),
+                          ("Serialización", "serializacion_ms")):
+        datos = reporte[clave]
+        print(f"⏱️  {titulo} (ms): p50={ms(datos['p50'])} p95={ms(datos['p95'])} "
+              f"p99={ms(datos['p99'])} max={ms(datos['max'])}")
+    print("\n📋 Respuestas por estado:")
+    for estado, cantidad in sorted(reporte["estados"].items()):
+        print(f"  {estado}: {cantidad}")
+
+def parsear_argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga para la API de Rápido Ochoa")
+    parser.add_argument("--url", default="http://localhost:8000", help="URL base de la API")
+    parser.add_argument("--guias", default="E121101188",
+                        type=lambda valor: [g.strip() for g in valor.split(",") if g.strip()],
+                        help="Guías válidas separadas por coma (se repiten durante la prueba)")
+    parser.add_argument("--proporcion-invalidas", type=float, default=0.1,
+                        help="Fracción de peticiones con guías inexistentes (0-1)")
+    parser.add_argument("--concurrencia", type=int, default=5, help="Peticiones simultáneas")
+    parser.add_argument("--rampa", type=float, default=10, help="Segundos para alcanzar la concurrencia")
+    parser.add_argument("--duracion", type=float, default=60, help="Segundos a plena carga")
+    parser.add_argument("--timeout", type=float, default=60, help="Timeout por petición en segundos")
+    parser.add_argument("--fields", default=None, help="Campos a pedir, ej: numero_guia,estado_actual")
+    parser.add_argument("--semilla", type=int, default=None, help="Semilla para repetir la misma mezcla")
+    parser.add_argument("--salida", default=None, help="Archivo JSON donde guardar los resultados")
+    args = parser.parse_args(argv)
+
+    if not args.guias:
+        parser.error("--guias no puede estar vacío")
+    if args.concurrencia < 1:
+        parser.error("--concurrencia debe ser al menos 1")
+    if args.rampa < 0:
+        parser.error("--rampa no puede ser negativa")
+    if args.duracion <= 0:
+        parser.error("--duracion debe ser mayor que 0")
+    if not 0 <= args.proporcion_invalidas <= 1:
+        parser.error("--proporcion-invalidas debe estar entre 0 y 1")
+    args.url = args.url.rstrip("/")
+    return args
+
+def main():
+    """Función principal"""
+    args = parsear_argumentos()
+    print(f"🚀 Prueba de carga contra {args.url}: {args.concurrencia} hilos, "
+          f"rampa {args.rampa}s, duración {args.duracion}s")
+
+    reporte = GeneradorCarga(args).ejecutar()
+    imprimir_reporte(reporte)
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(reporte, archivo, indent=2, ensure_ascii=False)
+        print(f"\n💾 Resultados guardados en {args.salida}")
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        print("\n\n👋 Prueba cancelada por el usuario")
+        sys.exit(0)
@@ -0,0 +1,196 @@
+"""
+Pruebas de la API de Rápido Ochoa
+Ejecutar con: pip install -r requirements-dev.txt && python -m pytest -q
+"""
+
+import csv
+import io
+import json
+import os
+import tempfile
+
+# El almacén se crea al importar main, por eso la ruta se define antes
+os.environ["RUTA_ALMACEN"] = os.path.join(tempfile.mkdtemp(), "encomiendas.db")
+
+import anyio
+import httpx
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import main
+
+def test_parsear_campos_sin_fields():
+    assert main._parsear_campos(None) is None
+    assert main._parsear_campos("") is None
+
+def test_parsear_campos_subconjunto():
+    assert main._parsear_campos("numero_guia, estado_actual") == {"numero_guia", "estado_actual"}
+
+def test_parsear_campos_invalido():
+    with pytest.raises(HTTPException) as error:
+        main._parsear_campos("numero_guia,foo")
+    assert error.value.status_code == 400
+    assert "foo" in error.value.detail
+
+def test_parsear_campos_solo_comas_devuelve_completo():
+    assert main._parsear_campos(",") is None
+
+def _encomienda(
+    numero_guia,
+    estado_actual="ENTREGADO",
+    origen="MEDELLIN (ANTIOQUIA)",
+    eventos=3,
+    fecha_admision="2025/01/01 10:00",
+    remitente_nombre="REMITENTE"
+):
+    return main.DatosEncomienda(
+        numero_guia=numero_guia,
+        fecha_admision=fecha_admision,
+        origen=origen,
+        destino="BOGOTA (CUNDINAMARCA)",
+        remitente_nombre=remitente_nombre,
+        destinatario_nombre="DESTINATARIO",
+        trazabilidad=[
+            main.EventoTrazabilidad(fecha="2025/01/01 10:00", detalle="GUIA ELABORADA", sede="MEDELLIN (ANTIOQUIA)")
+        ] * eventos,
+        estado_actual=estado_actual,
+        fecha_consulta="2025-01-01T10:00:00"
+    )
+
+@pytest.fixture
+def almacen(tmp_path, monkeypatch):
+    almacen = main.AlmacenEncomiendas(str(tmp_path / "encomiendas.db"))
+    monkeypatch.setattr(main, "almacen", almacen)
+    return almacen
+
+@pytest.fixture
+def cliente(almacen, monkeypatch):
+    def consultar_guia(numero_guia):
+        return _encomienda(numero_guia, eventos=50)
+
+    monkeypatch.setattr(main.scraper, "consultar_guia", consultar_guia)
+    return TestClient(main.app)
+
+def test_rastreo_get_con_fields(cliente):
+    respuesta = cliente.get("/api/rastreo/E1", params={"fields": "numero_guia,estado_actual"})
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {"numero_guia": "E1", "estado_actual": "ENTREGADO"}
+
+def test_rastreo_post_con_fields(cliente):
+    respuesta = cliente.post(
+        "/api/rastreo",
+        params={"fields": "numero_guia,estado_actual"},
+        json={"numero_guia": "E2"}
+    )
+    assert respuesta.status_code == 200
+    assert respuesta.json() == {"numero_guia": "E2", "estado_actual": "ENTREGADO"}
+
+def test_rastreo_fields_invalido(cliente):
+    respuesta = cliente.get("/api/rastreo/E1", params={"fields": "foo"})
+    assert respuesta.status_code == 400
+
+def test_rastreo_comprime_con_gzip(cliente):
+    respuesta = cliente.get("/api/rastreo/E1", headers={"Accept-Encoding": "gzip"})
+    assert respuesta.headers["content-encoding"] == "gzip"
+    assert len(respuesta.json()["trazabilidad"]) == 50
+
+def test_rastreo_reporta_server_timing(cliente):
+    respuesta = cliente.get("/api/rastreo/E1")
+    assert respuesta.headers["server-timing"].startswith("serializacion;dur=")
+
+def test_exportaciones_concurrentes_completas(almacen):
+    for i in range(300):
+        almacen.guardar(_encomienda(f"E{i:06d}"))
+
+    async def exportar_todo():
+        # Pocos hilos en el threadpool para forzar que cada next() cambie de hilo
+        anyio.to_thread.current_default_thread_limiter().total_tokens = 4
+        transporte = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://prueba") as cliente:
+            async def exportar():
+                respuesta = await cliente.get("/api/exportar", params={"tipo": "trazabilidad"})
+                return respuesta.text.count("\n")
+
+            resultados = []
+            async with anyio.create_task_group() as grupo:
+                for _ in range(10):
+                    async def tarea():
+                        resultados.append(await exportar())
+                    grupo.start_soon(tarea)
+            return resultados
+
+    assert anyio.run(exportar_todo) == [900] * 10
+
+def test_exportar_estado_exacto(almacen):
+    almacen.guardar(_encomienda("E1", estado_actual="ENTREGADO"))
+    almacen.guardar(_encomienda("E2", estado_actual="NO ENTREGADO"))
+
+    guias = [fila["numero_guia"] for fila in almacen.filas("encomiendas", estado="entregado")]
+    assert guias == ["E1"]
+
+def test_exportar_origen_escapa_comodines(almacen):
+    almacen.guardar(_encomienda("E1", origen="MEDELLIN (ANTIOQUIA)"))
+    almacen.guardar(_encomienda("E2", origen="CALI_100% (VALLE)"))
+
+    assert [fila["numero_guia"] for fila in almacen.filas("encomiendas", origen="%")] == ["E2"]
+    assert [fila["numero_guia"] for fila in almacen.filas("encomiendas", origen="I_1")] == ["E2"]
+    assert [fila["numero_guia"] for fila in almacen.filas("encomiendas", origen="medellin")] == ["E1"]
+
+def test_exportar_csv_content_type(almacen):
+    almacen.guardar(_encomienda("E1"))
+    respuesta = TestClient(main.app).get("/api/exportar", params={"formato": "csv"})
+    assert respuesta.headers["content-type"] == "text/csv; charset=utf-8"
+
+def _guias_exportadas(**params):
+    respuesta = TestClient(main.app).get("/api/exportar", params=params)
+    assert respuesta.status_code == 200
+    return [json.loads(linea)["numero_guia"] for linea in respuesta.text.splitlines()]
+
+def test_exportar_rango_de_fechas(almacen):
+    almacen.guardar(_encomienda("E1", fecha_admision="2025/01/01 00:00"))
+    almacen.guardar(_encomienda("E2", fecha_admision="2025/01/31 23:59"))
+    almacen.guardar(_encomienda("E3", fecha_admision="2025/02/01 00:00"))
+    almacen.guardar(_encomienda("E4", fecha_admision=""))
+
+    assert _guias_exportadas(desde="2025-01-01", hasta="2025-01-31") == ["E1", "E2"]
+    assert _guias_exportadas(desde="2025-01-31") == ["E2", "E3"]
+    assert _guias_exportadas(hasta="2025-01-31") == ["E1", "E2"]
+    assert _guias_exportadas(desde="2025-02-01", hasta="2025-02-01") == ["E3"]
+    assert _guias_exportadas() == ["E4", "E1", "E2", "E3"]
+
+def test_exportar_csv_escapa_valores(almacen):
+    remitente = 'PEREZ, "EL MONO"\nSUCURSAL'
+    almacen.guardar(_encomienda("E1", remitente_nombre=remitente))
+
+    respuesta = TestClient(main.app).get("/api/exportar", params={"formato": "csv"})
+    filas = list(csv.reader(io.StringIO(respuesta.text)))
+
+    assert filas[0] == main.AlmacenEncomiendas.COLUMNAS_ENCOMIENDA
+    assert len(filas) == 2
+    assert dict(zip(filas[0], filas[1]))["remitente_nombre"] == remitente
+
+def test_exportar_completo(almacen):
+    encomienda = _encomienda("E1")
+    almacen.guardar(encomienda)
+
+    respuesta = TestClient(main.app).get("/api/exportar", params={"tipo": "completo"})
+    lineas = respuesta.text.splitlines()
+
+    assert respuesta.headers["content-type"] == "application/x-ndjson"
+    assert len(lineas) == 1
+    assert main.DatosEncomienda.model_validate_json(lineas[0]) == encomienda
+
+@pytest.mark.parametrize("params", [
+    {"formato": "xml"},
+    {"formato": "csv", "tipo": "completo"},
+    {"tipo": "otro"},
+    {"desde": "2025-02-01", "hasta": "2025-01-31"},
+])
+def test_exportar_parametros_invalidos(almacen, params):
+    assert TestClient(main.app).get("/api/exportar", params=params).status_code == 400
+
+def test_health_reporta_version_de_la_app():
+    cliente = TestClient(main.app)
+    assert cliente.get("/api/health").json()["version"] == main.app.version
+    assert cliente.get("/").json()["version"] == main.app.version
@@ -0,0 +1,65 @@
+"""
+Pruebas del generador de carga
+Ejecutar con: pip install -r requirements-dev.txt && python -m pytest -q
+"""
+
+import prueba_carga
+
+def test_percentil_rango_mas_cercano():
+    valores = list(range(1, 101))
+    assert prueba_carga.percentil(valores, 50) == 50
+    assert prueba_carga.percentil(valores, 99) == 99
+    assert prueba_carga.percentil([], 50) is None
+
+def test_reporte_excluye_rampa(monkeypatch):
+    args = prueba_carga.parsear_argumentos(["--rampa", "10", "--duracion", "20"])
+    generador = prueba_carga.GeneradorCarga(args)
+    monkeypatch.setattr(generador, "_version_api", lambda: None)
+    generador.resultados = [
+        (1.0, "200", 900.0, None, False),
+        (5.0, "429", 5.0, None, False),
+        (10.0, "200", 100.0, 0.2, False),
+        (15.0, "404", 50.0, None, True),
+        (29.0, "200", 120.0, 0.1, False),
+    ]
+
+    reporte = generador._reporte(30.5)
+
+    assert reporte["total_peticiones"] == 3
+    assert reporte["rendimiento_rps"] == 3 / 20
+    assert reporte["latencia_ms"]["max"] == 120.0
+    assert reporte["estados"] == {"200": 2, "404": 1}
+    assert reporte["estados_guias_invalidas"] == {"404": 1}
+    assert reporte["rampa"]["total_peticiones"] == 2
+    assert reporte["rampa"]["errores"] == {"429": 1}
+
+def test_reporte_interrumpido_recorta_ventanas(monkeypatch):
+    args = prueba_carga.parsear_argumentos(["--rampa", "10", "--duracion", "20"])
+    generador = prueba_carga.GeneradorCarga(args)
+    monkeypatch.setattr(generador, "_version_api", lambda: None)
+    generador.interrumpida = True
+    generador.resultados = [
+        (2.0, "200", 100.0, None, False),
+        (12.0, "200", 100.0, None, False),
+    ]
+
+    reporte = generador._reporte(14.0)
+
+    assert reporte["interrumpida"] is True
+    assert reporte["segundos"] == 4.0
+    assert reporte["ventana"]["hasta_s"] == 14.0
+    assert reporte["rendimiento_rps"] == 1 / 4.0
+    assert reporte["rampa"]["segundos"] == 10
+
+def test_reporte_interrumpido_durante_rampa(monkeypatch):
+    args = prueba_carga.parsear_argumentos(["--rampa", "10", "--duracion", "20"])
+    generador = prueba_carga.GeneradorCarga(args)
+    monkeypatch.setattr(generador, "_version_api", lambda: None)
+    generador.resultados = [(2.0, "200", 100.0, None, False)]
+
+    reporte = generador._reporte(4.0)
+
+    assert reporte["total_peticiones"] == 0
+    assert reporte["rendimiento_rps"] is None
+    assert reporte["rampa"]["segundos"] == 4.0
+    prueba_carga.imprimir_reporte(reporte)